@@ -1,31 +1,188 @@
+import re
+import uuid
+from collections import OrderedDict
+from typing import Dict, List, Optional, Union
+
 import uvicorn
-from fastapi import FastAPI, HTTPException
-from pydantic import BaseModel
+from fastapi import FastAPI, HTTPException, Query
+from fastapi.middleware.gzip import GZipMiddleware
+from pydantic import BaseModel, Field, ValidationError, field_validator
 
 from src.agent.main import build_agent
 
+MAX_LIMIT = 50
+MAX_CACHED_RESULTS = 128
+JSON_FENCE = re.compile(r"^```(?:json)?\s*(.*?)\s*```$", re.DOTALL | re.IGNORECASE)
+
 graph = build_agent()
-app = FastAPI(title="agent_api_rag", version="1.0")
+app = FastAPI(title="agent_api_rag", version="1.1")
+app.add_middleware(GZipMiddleware, minimum_size=1000)
+
+# Resultados recentes do agente, para paginar documentos sem reexecutar o grafo
+results_cache: "OrderedDict[str, AgentResult]" = OrderedDict()
+
 
 class QueryInput(BaseModel):
     question: str
+    limit: int = Field(default=10, ge=1, le=MAX_LIMIT)
+    offset: int = Field(default=0, ge=0)
+    include_graph_datas: bool = True
+
+
+class RelevanceScore(BaseModel):
+    title: str
+    score: float
+
+
+class GraphDatas(BaseModel):
+    experiments_timeline: Dict[str, int] = Field(default_factory=dict)
+    subject_distribution: Dict[str, int] = Field(default_factory=dict)
+    relevance_scores: List[RelevanceScore] = Field(default_factory=list)
+
+    @field_validator("experiments_timeline", "subject_distribution", mode="before")
+    @classmethod
+    def null_as_empty_dict(cls, value):
+        return {} if value is None else value
+
+    @field_validator("relevance_scores", mode="before")
+    @classmethod
+    def null_as_empty_list(cls, value):
+        return [] if value is None else value
+
+
+class Document(BaseModel):
+    title: Optional[str] = None
+    authors: Optional[str] = None
+    date: Optional[str] = None
+    summary: Optional[str] = None
+    url: Optional[str] = None
+    keywords: List[str] = Field(default_factory=list)
+    relevance: Optional[Union[str, float]] = None
+
+    @field_validator("keywords", mode="before")
+    @classmethod
+    def null_as_empty_list(cls, value):
+        return [] if value is None else value
+
+    @field_validator("authors", mode="before")
+    @classmethod
+    def join_authors(cls, value):
+        if isinstance(value, list):
+            return ", ".join(str(author) for author in value)
+        return value
+
+    @field_validator("date", mode="before")
+    @classmethod
+    def date_as_str(cls, value):
+        return str(value) if isinstance(value, int) else value
+
+
+class AgentResult(BaseModel):
+    abstract: Optional[str] = None
+    graph_datas: GraphDatas = Field(default_factory=GraphDatas)
+    documents: List[Document] = Field(default_factory=list)
+
+    @field_validator("graph_datas", mode="before")
+    @classmethod
+    def null_as_empty_graph_datas(cls, value):
+        return {} if value is None else value
+
+    @field_validator("documents", mode="before")
+    @classmethod
+    def null_as_empty_list(cls, value):
+        return [] if value is None else value
+
 
-@app.post("/query")
+class DocumentsPage(BaseModel):
+    query_id: str
+    total_documents: int
+    limit: int
+    offset: int
+    documents: List[Document]
+
+
+class QueryResponse(DocumentsPage):
+    abstract: Optional[str] = None
+    graph_datas: Optional[GraphDatas] = None
+
+
+def message_text(content: Union[str, list]) -> str:
+    """Junta o conteúdo da mensagem, que pode vir como lista de blocos."""
+    if isinstance(content, str):
+        return content
+    return "".join(
+        block if isinstance(block, str) else block.get("text", "")
+        for block in content
+        if isinstance(block, str) or (isinstance(block, dict) and block.get("type") == "text")
+    )
+
+
+def parse_agent_output(content: Union[str, list]) -> AgentResult:
+    """Valida o JSON gerado pelo LLM, removendo cercas de markdown se houver."""
+    text = message_text(content).strip()
+    fenced = JSON_FENCE.match(text)
+    if fenced:
+        text = fenced.group(1)
+    return AgentResult.model_validate_json(text)
+
+
+def store_result(result: AgentResult) -> str:
+    query_id = uuid.uuid4().hex
+    results_cache[query_id] = result
+    if len(results_cache) > MAX_CACHED_RESULTS:
+        results_cache.popitem(last=False)
+    return query_id
+
+
+def paginate(query_id: str, result: AgentResult, limit: int, offset: int) -> dict:
+    return {
+        "query_id": query_id,
+        "total_documents": len(result.documents),
+        "limit": limit,
+        "offset": offset,
+        "documents": result.documents[offset:offset + limit],
+    }
+
+
+@app.post("/query", response_model=QueryResponse, response_model_exclude_none=True)
 async def query_agent(payload: QueryInput):
     try:
         state = {"messages": [{"role": "user", "content": payload.question}]}
         result = graph.invoke(state)
-
-        return {
-            "response": result["messages"][-1].content,
-        }
+        content = result["messages"][-1].content
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+    try:
+        agent_result = parse_agent_output(content)
+    except ValidationError as e:
+        raise HTTPException(status_code=502, detail=f"Invalid agent output: {e}")
+
+    query_id = store_result(agent_result)
+    return QueryResponse(
+        **paginate(query_id, agent_result, payload.limit, payload.offset),
+        abstract=agent_result.abstract,
+        graph_datas=agent_result.graph_datas if payload.include_graph_datas else None,
+    )
+
+
+@app.get("/query/{query_id}/documents", response_model=DocumentsPage, response_model_exclude_none=True)
+async def query_documents(
+    query_id: str,
+    limit: int = Query(default=10, ge=1, le=MAX_LIMIT),
+    offset: int = Query(default=0, ge=0),
+):
+    agent_result = results_cache.get(query_id)
+    if agent_result is None:
+        raise HTTPException(status_code=404, detail="Query not found or expired")
+    results_cache.move_to_end(query_id)
+    return paginate(query_id, agent_result, limit, offset)
+
+
 @app.get("/health")
 async def health():
     return {"status": "ok"}
 
 
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8000)
\ No newline at end of file
+    uvicorn.run(app, host="0.0.0.0", port=8000)
@@ -179,12 +179,10 @@ with col_btn2:
     search_button = st.button("🚀 Pesquisar", use_container_width=True, type="primary")
 
 
-def fetch_data(query_text, api_endpoint):
-    """Faz requisição POST para a API local"""
+def handle_request_errors(request):
+    """Executa a requisição para a API local tratando erros de conexão"""
     try:
-        headers = {'Content-Type': 'application/json'}
-        payload = {'question': query_text}
-        response = requests.post(api_endpoint, json=payload, headers=headers, timeout=30)
+        response = request()
         response.raise_for_status()
         return response.json()
     except requests.exceptions.ConnectionError:
@@ -199,10 +197,31 @@ def fetch_data(query_text, api_endpoint):
         return None
 
 
+def fetch_data(query_text, api_endpoint, limit):
+    """Faz requisição POST para a API local"""
+    headers = {'Content-Type': 'application/json'}
+    payload = {
+        'question': query_text,
+        'limit': limit,
+        'offset': 0,
+    }
+    return handle_request_errors(
+        lambda: requests.post(api_endpoint, json=payload, headers=headers, timeout=30)
+    )
+
+
+def fetch_more_documents(api_endpoint, query_id, limit, offset):
+    """Busca a próxima página de documentos de uma consulta já executada"""
+    params = {'limit': limit, 'offset': offset}
+    return handle_request_errors(
+        lambda: requests.get(f"{api_endpoint}/{query_id}/documents", params=params, timeout=30)
+    )
+
+
 # --- Processar busca ---
 if search_button and query:
     with st.spinner('🔄 Analisando publicações da NASA...'):
-        data = fetch_data(query, api_url)
+        data = fetch_data(query, api_url, max_articles)
 
         if data is None:
             st.warning("⚠️ Usando dados de demonstração")
@@ -249,153 +268,168 @@ if search_button and query:
                 ]
             }
 
-        # --- Resumo ---
-        st.markdown("## 📊 Resumo dos Resultados")
-        st.info(data.get("abstract", "Nenhum resumo disponível"))
-
-        # --- Métricas ---
-        graph_data = data.get("graph_datas", {})
-        documents = data.get("documents", [])[:max_articles]
-
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.metric("📚 Total de Artigos", len(documents), delta=None)
-        with col2:
-            if graph_data.get("relevance_scores"):
-                avg_relevance = sum(d["score"] for d in graph_data["relevance_scores"]) / len(
-                    graph_data["relevance_scores"])
-                st.metric("⭐ Relevância Média", f"{avg_relevance * 100:.1f}%", delta=None)
-            else:
-                st.metric("⭐ Relevância Média", "N/A")
-        with col3:
-            if graph_data.get("subject_distribution"):
-                st.metric("🔬 Áreas de Pesquisa", len(graph_data["subject_distribution"]), delta=None)
-            else:
-                st.metric("🔬 Áreas de Pesquisa", "N/A")
-
-        st.markdown("---")
-
-        # --- Gráficos ---
-        if show_charts and graph_data:
-            st.markdown("## 📈 Visualizações")
-
-            chart_col1, chart_col2 = st.columns(2)
-
-            # Timeline
-            if "experiments_timeline" in graph_data:
-                with chart_col1:
-                    st.markdown("### 📅 Experimentos por Ano")
-                    timeline_data = graph_data["experiments_timeline"]
-                    fig_timeline = go.Figure(data=[go.Bar(
-                        x=list(timeline_data.keys()),
-                        y=list(timeline_data.values()),
-                        marker=dict(
-                            color=list(timeline_data.values()),
-                            colorscale='Viridis',
-                            line=dict(color='rgba(255, 255, 255, 0.3)', width=1)
-                        ),
-                        text=list(timeline_data.values()),
-                        textposition='auto',
-                        hovertemplate='<b>Ano:</b> %{x}<br><b>Experimentos:</b> %{y}<extra></extra>'
-                    )])
-                    fig_timeline.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='#e0e0e0', size=12),
-                        xaxis_title="Ano",
-                        yaxis_title="Número de Experimentos",
-                        height=350,
-                        margin=dict(l=40, r=40, t=40, b=40)
-                    )
-                    st.plotly_chart(fig_timeline, use_container_width=True)
-
-            # Distribuição por área
-            if "subject_distribution" in graph_data:
-                with chart_col2:
-                    st.markdown("### 🎯 Distribuição por Área")
-                    subject_data = graph_data["subject_distribution"]
-                    fig_pie = go.Figure(data=[go.Pie(
-                        labels=list(subject_data.keys()),
-                        values=list(subject_data.values()),
-                        marker=dict(
-                            colors=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe'],
-                            line=dict(color='rgba(255, 255, 255, 0.3)', width=2)
-                        ),
-                        textinfo='label+percent',
-                        hovertemplate='<b>%{label}</b><br>Artigos: %{value}<br>Percentual: %{percent}<extra></extra>'
-                    )])
-                    fig_pie.update_layout(
-                        plot_bgcolor='rgba(0,0,0,0)',
-                        paper_bgcolor='rgba(0,0,0,0)',
-                        font=dict(color='#e0e0e0', size=12),
-                        height=350,
-                        showlegend=True,
-                        margin=dict(l=40, r=40, t=40, b=40)
-                    )
-                    st.plotly_chart(fig_pie, use_container_width=True)
-
-            # Relevância (full width)
-            if "relevance_scores" in graph_data:
-                st.markdown("### 🎯 Score de Relevância")
-                rel_data = graph_data["relevance_scores"]
-                fig_rel = go.Figure(data=[go.Bar(
-                    y=[item["title"][:50] + "..." if len(item["title"]) > 50 else item["title"] for item in rel_data],
-                    x=[item["score"] * 100 for item in rel_data],
-                    orientation='h',
+        st.session_state["result"] = data
+
+elif search_button and not query:
+    st.warning("⚠️ Por favor, digite uma pergunta antes de pesquisar.")
+
+# --- Exibir resultados ---
+data = st.session_state.get("result")
+if data:
+    # --- Resumo ---
+    st.markdown("## 📊 Resumo dos Resultados")
+    st.info(data.get("abstract", "Nenhum resumo disponível"))
+
+    # --- Métricas ---
+    graph_data = data.get("graph_datas", {})
+    documents = data.get("documents", [])
+    total_documents = data.get("total_documents", len(documents))
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("📚 Total de Artigos", total_documents, delta=None)
+    with col2:
+        if graph_data.get("relevance_scores"):
+            avg_relevance = sum(d["score"] for d in graph_data["relevance_scores"]) / len(
+                graph_data["relevance_scores"])
+            st.metric("⭐ Relevância Média", f"{avg_relevance * 100:.1f}%", delta=None)
+        else:
+            st.metric("⭐ Relevância Média", "N/A")
+    with col3:
+        if graph_data.get("subject_distribution"):
+            st.metric("🔬 Áreas de Pesquisa", len(graph_data["subject_distribution"]), delta=None)
+        else:
+            st.metric("🔬 Áreas de Pesquisa", "N/A")
+
+    st.markdown("---")
+
+    # --- Gráficos ---
+    if show_charts and graph_data:
+        st.markdown("## 📈 Visualizações")
+
+        chart_col1, chart_col2 = st.columns(2)
+
+        # Timeline
+        if "experiments_timeline" in graph_data:
+            with chart_col1:
+                st.markdown("### 📅 Experimentos por Ano")
+                timeline_data = graph_data["experiments_timeline"]
+                fig_timeline = go.Figure(data=[go.Bar(
+                    x=list(timeline_data.keys()),
+                    y=list(timeline_data.values()),
                     marker=dict(
-                        color=[item["score"] * 100 for item in rel_data],
-                        colorscale='Greens',
+                        color=list(timeline_data.values()),
+                        colorscale='Viridis',
                         line=dict(color='rgba(255, 255, 255, 0.3)', width=1)
                     ),
-                    text=[f"{item['score'] * 100:.1f}%" for item in rel_data],
+                    text=list(timeline_data.values()),
                     textposition='auto',
-                    hovertemplate='<b>%{y}</b><br>Relevância: %{x:.1f}%<extra></extra>'
+                    hovertemplate='<b>Ano:</b> %{x}<br><b>Experimentos:</b> %{y}<extra></extra>'
                 )])
-                fig_rel.update_layout(
+                fig_timeline.update_layout(
                     plot_bgcolor='rgba(0,0,0,0)',
                     paper_bgcolor='rgba(0,0,0,0)',
-                    font=dict(color='#e0e0e0', size=11),
-                    xaxis_title="Relevância (%)",
-                    height=max(300, len(rel_data) * 50),
-                    xaxis_range=[0, 100],
-                    margin=dict(l=250, r=40, t=40, b=40)
+                    font=dict(color='#e0e0e0', size=12),
+                    xaxis_title="Ano",
+                    yaxis_title="Número de Experimentos",
+                    height=350,
+                    margin=dict(l=40, r=40, t=40, b=40)
                 )
-                st.plotly_chart(fig_rel, use_container_width=True)
-
-        st.markdown("---")
-
-        # --- Artigos ---
-        st.markdown("## 📚 Artigos Relevantes")
-        if documents:
-            for idx, article in enumerate(documents, 1):
-                st.markdown(f"""
-                    <div class="article-card">
-                        <h3>{idx}. {article.get('title', 'Sem título')}</h3>
-                        <p style="color: #a0a0a0; font-size: 0.9em; margin-bottom: 10px;">
-                            👥 {article.get('authors', 'Autores não disponíveis')} | 
-                            📅 {article.get('date', 'Data não disponível')} | 
-                            <span style="background: linear-gradient(135deg, #00cc66, #00994d); 
-                                         color: white; padding: 4px 12px; border-radius: 15px; 
-                                         font-weight: bold; font-size: 0.85em;">
-                                ⭐ Relevância: {article.get('relevance', 'N/A')}
-                            </span>
-                        </p>
-                        <p style="color: #d0d0d0; line-height: 1.7; margin-bottom: 15px; font-size: 0.95em;">
-                            {article.get('summary', 'Resumo não disponível')}
-                        </p>
-                        <p style="margin-bottom: 15px;">
-                            {' '.join(f'<span class="keyword-tag">{kw}</span>' for kw in article.get('keywords', []))}
-                        </p>
-                        <a href="{article.get('url', '#')}" target="_blank" style="font-size: 0.95em;">
-                            🔗 Acessar Artigo Completo →
-                        </a>
-                    </div>
-                """, unsafe_allow_html=True)
-        else:
-            st.warning("🔍 Nenhum artigo encontrado para esta consulta. Tente reformular sua busca.")
+                st.plotly_chart(fig_timeline, use_container_width=True)
+
+        # Distribuição por área
+        if "subject_distribution" in graph_data:
+            with chart_col2:
+                st.markdown("### 🎯 Distribuição por Área")
+                subject_data = graph_data["subject_distribution"]
+                fig_pie = go.Figure(data=[go.Pie(
+                    labels=list(subject_data.keys()),
+                    values=list(subject_data.values()),
+                    marker=dict(
+                        colors=['#667eea', '#764ba2', '#f093fb', '#4facfe', '#00f2fe'],
+                        line=dict(color='rgba(255, 255, 255, 0.3)', width=2)
+                    ),
+                    textinfo='label+percent',
+                    hovertemplate='<b>%{label}</b><br>Artigos: %{value}<br>Percentual: %{percent}<extra></extra>'
+                )])
+                fig_pie.update_layout(
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    paper_bgcolor='rgba(0,0,0,0)',
+                    font=dict(color='#e0e0e0', size=12),
+                    height=350,
+                    showlegend=True,
+                    margin=dict(l=40, r=40, t=40, b=40)
+                )
+                st.plotly_chart(fig_pie, use_container_width=True)
+
+        # Relevância (full width)
+        if "relevance_scores" in graph_data:
+            st.markdown("### 🎯 Score de Relevância")
+            rel_data = graph_data["relevance_scores"]
+            fig_rel = go.Figure(data=[go.Bar(
+                y=[item["title"][:50] + "..." if len(item["title"]) > 50 else item["title"] for item in rel_data],
+                x=[item["score"] * 100 for item in rel_data],
+                orientation='h',
+                marker=dict(
+                    color=[item["score"] * 100 for item in rel_data],
+                    colorscale='Greens',
+                    line=dict(color='rgba(255, 255, 255, 0.3)', width=1)
+                ),
+                text=[f"{item['score'] * 100:.1f}%" for item in rel_data],
+                textposition='auto',
+                hovertemplate='<b>%{y}</b><br>Relevância: %{x:.1f}%<extra></extra>'
+            )])
+            fig_rel.update_layout(
+                plot_bgcolor='rgba(0,0,0,0)',
+                paper_bgcolor='rgba(0,0,0,0)',
+                font=dict(color='#e0e0e0', size=11),
+                xaxis_title="Relevância (%)",
+                height=max(300, len(rel_data) * 50),
+                xaxis_range=[0, 100],
+                margin=dict(l=250, r=40, t=40, b=40)
+            )
+            st.plotly_chart(fig_rel, use_container_width=True)
 
-elif search_button and not query:
-    st.warning("⚠️ Por favor, digite uma pergunta antes de pesquisar.")
+    st.markdown("---")
+
+    # --- Artigos ---
+    st.markdown("## 📚 Artigos Relevantes")
+    if documents:
+        for idx, article in enumerate(documents, 1):
+            st.markdown(f"""
+                <div class="article-card">
+                    <h3>{idx}. {article.get('title', 'Sem título')}</h3>
+                    <p style="color: #a0a0a0; font-size: 0.9em; margin-bottom: 10px;">
+                        👥 {article.get('authors', 'Autores não disponíveis')} | 
+                        📅 {article.get('date', 'Data não disponível')} | 
+                        <span style="background: linear-gradient(135deg, #00cc66, #00994d); 
+                                     color: white; padding: 4px 12px; border-radius: 15px; 
+                                     font-weight: bold; font-size: 0.85em;">
+                            ⭐ Relevância: {article.get('relevance', 'N/A')}
+                        </span>
+                    </p>
+                    <p style="color: #d0d0d0; line-height: 1.7; margin-bottom: 15px; font-size: 0.95em;">
+                        {article.get('summary', 'Resumo não disponível')}
+                    </p>
+                    <p style="margin-bottom: 15px;">
+                        {' '.join(f'<span class="keyword-tag">{kw}</span>' for kw in article.get('keywords', []))}
+                    </p>
+                    <a href="{article.get('url', '#')}" target="_blank" style="font-size: 0.95em;">
+                        🔗 Acessar Artigo Completo →
+                    </a>
+                </div>
+            """, unsafe_allow_html=True)
+    else:
+        st.warning("🔍 Nenhum artigo encontrado para esta consulta. Tente reformular sua busca.")
+
+    # --- Paginação ---
+    remaining = total_documents - len(documents)
+    if data.get("query_id") and remaining > 0:
+        if st.button(f"⬇️ Carregar mais artigos ({remaining} restantes)", use_container_width=True):
+            page = fetch_more_documents(api_url, data["query_id"], max_articles, len(documents))
+            if page is not None:
+                data["documents"] = documents + page.get("documents", [])
+                st.rerun()
 
 # Footer
 st.markdown("---")
@@ -0,0 +1,21 @@
+import importlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+
+@pytest.fixture
+def main(monkeypatch):
+    """Importa api.main com um agente falso, sem carregar o índice FAISS nem o LLM."""
+    monkeypatch.setitem(sys.modules, "src.agent.main", SimpleNamespace(build_agent=lambda: None))
+    monkeypatch.delitem(sys.modules, "api.main", raising=False)
+    module = importlib.import_module("api.main")
+    yield module
+    sys.modules.pop("api.main", None)
+
+
+@pytest.fixture
+def client(main):
+    return TestClient(main.app)
@@ -0,0 +1,146 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+
+def make_output(n_documents=3, **overrides):
+    output = {
+        "abstract": "Resumo.",
+        "graph_datas": {
+            "experiments_timeline": {"2023": 2},
+            "subject_distribution": {"Plant Biology": 1},
+            "relevance_scores": [{"title": "Doc 0", "score": 0.9}],
+        },
+        "documents": [
+            {"title": f"Doc {i}", "url": f"https://example.org/{i}", "keywords": ["space"]}
+            for i in range(n_documents)
+        ],
+    }
+    output.update(overrides)
+    return output
+
+
+class FakeGraph:
+    def __init__(self, content):
+        self.content = content
+
+    def invoke(self, state):
+        return {"messages": [SimpleNamespace(content=self.content)]}
+
+
+def test_parse_agent_output_accepts_nulls_allowed_by_prompt(main):
+    result = main.parse_agent_output(json.dumps({
+        "abstract": None,
+        "graph_datas": None,
+        "documents": None,
+    }))
+    assert result.documents == []
+    assert result.graph_datas.experiments_timeline == {}
+
+    result = main.parse_agent_output(json.dumps(make_output(
+        graph_datas={
+            "experiments_timeline": None,
+            "subject_distribution": None,
+            "relevance_scores": None,
+        },
+        documents=[{"title": "Doc", "keywords": None}],
+    )))
+    assert result.graph_datas.relevance_scores == []
+    assert result.documents[0].keywords == []
+
+
+def test_parse_agent_output_normalizes_document_fields(main):
+    result = main.parse_agent_output(json.dumps(make_output(
+        documents=[{"authors": ["Smith, J.", "Chen, L."], "date": 2024}],
+    )))
+    assert result.documents[0].authors == "Smith, J., Chen, L."
+    assert result.documents[0].date == "2024"
+
+
+@pytest.mark.parametrize("template", [
+    "```json\n{}\n```",
+    "```{}```",
+    "```json {} ```",
+    "```JSON\n{}\n```",
+    "  {}  ",
+])
+def test_parse_agent_output_strips_fences(main, template):
+    text = template.format(json.dumps(make_output(n_documents=1)))
+    assert len(main.parse_agent_output(text).documents) == 1
+
+
+def test_parse_agent_output_accepts_content_blocks(main):
+    payload = json.dumps(make_output(n_documents=2))
+    content = [
+        {"type": "text", "text": "```json\n" + payload[:10]},
+        {"type": "tool_use", "id": "call_1"},
+        object(),
+        {"type": "text", "text": payload[10:] + "\n```"},
+    ]
+    assert len(main.parse_agent_output(content).documents) == 2
+
+
+def test_paginate_slices_documents(main):
+    result = main.parse_agent_output(json.dumps(make_output(n_documents=5)))
+    page = main.paginate("abc", result, limit=2, offset=4)
+    assert page["total_documents"] == 5
+    assert [d.title for d in page["documents"]] == ["Doc 4"]
+
+
+def test_store_result_evicts_oldest(main, monkeypatch):
+    monkeypatch.setattr(main, "MAX_CACHED_RESULTS", 2)
+    ids = [main.store_result(main.AgentResult()) for _ in range(3)]
+    assert list(main.results_cache) == ids[1:]
+
+
+def test_query_returns_page_and_follow_up_page(main, client, monkeypatch):
+    output = make_output(n_documents=3)
+    output["documents"][0]["summary"] = None
+    output["documents"][2]["summary"] = None
+    monkeypatch.setattr(main, "graph", FakeGraph(json.dumps(output)))
+
+    response = client.post("/query", json={"question": "plants?", "limit": 2})
+    assert response.status_code == 200
+    first = response.json()
+    assert first["total_documents"] == 3
+    assert [d["title"] for d in first["documents"]] == ["Doc 0", "Doc 1"]
+    assert first["graph_datas"]["experiments_timeline"] == {"2023": 2}
+
+    response = client.get(
+        f"/query/{first['query_id']}/documents", params={"limit": 2, "offset": 2}
+    )
+    assert response.status_code == 200
+    second = response.json()
+    assert [d["title"] for d in second["documents"]] == ["Doc 2"]
+    assert set(second["documents"][0]) == set(first["documents"][0])
+
+
+def test_query_can_omit_graph_datas(main, client, monkeypatch):
+    monkeypatch.setattr(main, "graph", FakeGraph(json.dumps(make_output())))
+    response = client.post(
+        "/query", json={"question": "plants?", "include_graph_datas": False}
+    )
+    assert response.status_code == 200
+    assert "graph_datas" not in response.json()
+
+
+def test_query_rejects_invalid_agent_output(main, client, monkeypatch):
+    monkeypatch.setattr(main, "graph", FakeGraph("not json"))
+    response = client.post("/query", json={"question": "plants?"})
+    assert response.status_code == 502
+
+
+def test_query_maps_graph_errors_to_500(main, client, monkeypatch):
+    class FailingGraph:
+        def invoke(self, state):
+            main.AgentResult.model_validate({"documents": "not a list"})
+
+    monkeypatch.setattr(main, "graph", FailingGraph())
+    response = client.post("/query", json={"question": "plants?"})
+    assert response.status_code == 500
+
+
+def test_documents_unknown_query_id(client):
+    response = client.get("/query/unknown/documents")
+    assert response.status_code == 404